@@ -0,0 +1,70 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+"""
+Compiled kernels for tabulating and inverting tracer redshift CDFs.
+"""
+
+cdef void _cumulative_cdf(const double[::1] z, const double[::1] pdf, double[::1] out) noexcept nogil:
+    cdef Py_ssize_t i, n = z.shape[0]
+    cdef double total = 0.0
+    out[0] = 0.0
+    for i in range(1, n):
+        total += 0.5 * (pdf[i] + pdf[i - 1]) * (z[i] - z[i - 1])
+        out[i] = total
+    for i in range(1, n - 1):
+        out[i] /= total
+    out[n - 1] = 1.0  # Exact, so the sampler's upper bracket never rounds below 1
+
+cdef void _inverse_cdf_sample(const double[::1] cdf, const double[::1] z_grid, const double[::1] u, double[::1] out) noexcept nogil:
+    cdef Py_ssize_t i, lo, hi, mid, m = cdf.shape[0], n = u.shape[0]
+    cdef double x
+    for i in range(n):
+        x = u[i]
+        if x >= cdf[m - 1]:
+            # Past the top of the table: return the last node rather than bisecting into a flat tail
+            out[i] = z_grid[m - 1]
+            continue
+        # Bisect for the last node with cdf[lo] <= x, so cdf[lo + 1] > x
+        lo = 0
+        hi = m - 1
+        while hi - lo > 1:
+            mid = (lo + hi) >> 1
+            if cdf[mid] <= x:
+                lo = mid
+            else:
+                hi = mid
+        out[i] = z_grid[lo] + (x - cdf[lo]) * (z_grid[hi] - z_grid[lo]) / (cdf[hi] - cdf[lo])
+
+def cumulative_cdf(const double[::1] z, const double[::1] pdf, double[::1] out):
+    """
+    Cumulative trapezoidal integral of pdf over z, normalized so that out[-1] == 1.
+
+    :param z: Monotonic redshift grid, at least two points
+    :param pdf: Unnormalized n(z) sampled on z
+    :param out: Output buffer, same length as z
+    :raises ValueError: If the lengths differ or z has fewer than two points
+    """
+    if z.shape[0] < 2:
+        raise ValueError("z must have at least two points")
+    if pdf.shape[0] != z.shape[0] or out.shape[0] != z.shape[0]:
+        raise ValueError("z, pdf and out must have the same length")
+    with nogil:
+        _cumulative_cdf(z, pdf, out)
+
+def inverse_cdf_sample(const double[::1] cdf, const double[::1] z_grid, const double[::1] u, double[::1] out):
+    """
+    Maps uniform deviates u in [0, 1) through the inverse of a tabulated CDF by linear interpolation.
+
+    :param cdf: Non-decreasing CDF on z_grid with cdf[0] == 0 and cdf[-1] == 1, at least two points
+    :param z_grid: Redshift grid the CDF is tabulated on
+    :param u: Uniform deviates
+    :param out: Output buffer, same length as u; may be u itself
+    :raises ValueError: If the lengths differ or the table has fewer than two points
+    """
+    if cdf.shape[0] < 2:
+        raise ValueError("cdf must have at least two points")
+    if z_grid.shape[0] != cdf.shape[0]:
+        raise ValueError("cdf and z_grid must have the same length")
+    if out.shape[0] != u.shape[0]:
+        raise ValueError("u and out must have the same length")
+    with nogil:
+        _inverse_cdf_sample(cdf, z_grid, u, out)
@@ -1,63 +1,140 @@
+import math
+from functools import cached_property
+
 import numpy as np
-from scipy.integrate import quad
-from scipy.interpolate import interp1d
+from scipy.integrate import quad_vec
+
+def _inv_E(z, Omega_m, Omega_lambda):
+    """
+    Computes 1 / E(z) for a flat LambdaCDM cosmology.
+
+    :param z: Redshift (scalar or array)
+    :param Omega_m: Matter density parameter
+    :param Omega_lambda: Dark energy density parameter
+    :return: 1 / E(z)
+    """
+    return 1.0 / np.sqrt(Omega_m * (1 + z) ** 3 + Omega_lambda)
 
 class Cosmology:
-    def __init__(self):
+    def __init__(self, h: float = 0.6737, Omega_m: float = 0.3147, Omega_lambda: float = 0.6853):
         """
-        Initializes the Cosmology class with Planck 2018 cosmological parameters.
+        Initializes the Cosmology class, defaulting to Planck 2018 cosmological parameters.
+
+        :param h: Dimensionless Hubble parameter
+        :param Omega_m: Matter density parameter
+        :param Omega_lambda: Dark energy density parameter
         """
-        self.h = 0.6737  # Dimensionless Hubble parameter
+        self.h = h  # Dimensionless Hubble parameter
         self.H0 = 100 * self.h  # Hubble constant in km/s/Mpc
-        self.Omega_m = 0.3147  # Matter density parameter
-        self.Omega_lambda = 0.6853  # Dark energy density parameter
+        self.Omega_m = Omega_m  # Matter density parameter
+        self.Omega_lambda = Omega_lambda  # Dark energy density parameter
         self.c = 299792.458  # Speed of light in km/s
-        self._build_lookups()
 
-    def E(self, z: float) -> float:
+    def E(self, z: np.ndarray | float) -> np.ndarray | float:
         """
         Computes the dimensionless Hubble parameter E(z).
 
-        :param z: Redshift
+        :param z: Redshift (scalar or array)
         :return: E(z)
         """
         return np.sqrt(self.Omega_m * (1 + z) ** 3 + self.Omega_lambda)
     
-    def _builds_lookups(self):
+    @cached_property
+    def _distance_lookup(self) -> tuple[np.ndarray, np.ndarray]:
         """
-        Precomputes look-up tables for comoving distance and distance modulus.
+        Look-up table for comoving distance and distance modulus, built on first access.
+
+        The integrals of 1 / E(z) over every grid subinterval [z_i, z_i+1] are computed in a
+        single adaptive quad_vec call, with error control on the whole vector, then summed
+        cumulatively into comoving distances.
         """
-        z_vals = np.linspace(0, 5, 1000)
-        d_c_vals = np.zeros_like(z_vals)
-        for i, z in enumerate(z_vals):
-            integral, _ = quad(lambda z_prime: self.c / self.H0 / self.E(z_prime), 0, z)
-            d_c_vals[i] = integral
-        self.comoving_distance_lookup = interp1d(z_vals, d_c_vals, kind='cubic', fill_value="extrapolate")
+        z_vals = np.linspace(0, 5, 10001)
+        z_lo = z_vals[:-1]
+        dz = np.diff(z_vals)
+        # Map t in [0, 1] onto each subinterval so one vector-valued integrand covers them all
+        steps, _ = quad_vec(lambda t: dz * _inv_E(z_lo + t * dz, self.Omega_m, self.Omega_lambda), 0.0, 1.0, epsrel=1e-10, norm='max')
+        d_c_vals = (self.c / self.H0) * np.concatenate(([0.0], np.cumsum(steps)))
+        return z_vals, d_c_vals
     
-    def comoving_distance(self, z: float) -> float:
+    def _interp_comoving(self, z: np.ndarray | float) -> np.ndarray | float:
+        """
+        Interpolates the comoving distance look-up table, refusing redshifts outside it.
+
+        :param z: Redshift (scalar or array)
+        :return: Comoving distance in Mpc
+        :raises ValueError: If any z lies outside the tabulated redshift range
+        """
+        z_grid, d_c_grid = self._distance_lookup
+        if np.isscalar(z):
+            in_range = z_grid[0] <= z <= z_grid[-1]  # Plain comparison keeps the scalar path cheap
+        else:
+            in_range = not (np.any(z < z_grid[0]) or np.any(z > z_grid[-1]))
+        if not in_range:
+            raise ValueError(f"Redshift outside the distance look-up table range [{z_grid[0]}, {z_grid[-1]}]")
+        return np.interp(z, z_grid, d_c_grid)
+
+    def comoving_distance(self, z: np.ndarray | float) -> np.ndarray | float:
         """
         Computes the comoving distance to redshift z.
 
-        :param z: Redshift
+        :param z: Redshift (scalar or array), within [0, 5]
         :return: Comoving distance in Mpc
+        :raises ValueError: If any z lies outside [0, 5]
         """
-        return self.comoving_distance_lookup(z)
+        return self._interp_comoving(z)
         
-    def luminosity_distance(self, z: float) -> float:
+    def luminosity_distance(self, z: np.ndarray | float) -> np.ndarray | float:
         """
         Computes the luminosity distance to redshift z.
 
-        :param z: Redshift
+        :param z: Redshift (scalar or array), within [0, 5]
         :return: Luminosity distance in Mpc
+        :raises ValueError: If any z lies outside [0, 5]
         """
         return (1 + z) * self.comoving_distance(z)  
      
-    def distance_modulus(self, z: float) -> float:
+    def distance_modulus(self, z: np.ndarray | float) -> np.ndarray | float:
         """
         Computes the distance modulus to redshift z.
 
-        :param z: Redshift
+        :param z: Redshift (scalar or array), within [0, 5]
         :return: Distance modulus
+        :raises ValueError: If any z lies outside [0, 5]
         """
-        d_L = self.luminosity_distance(z)
-        return 5 * np.log10(d_L * 1e6) - 5  # Convert Mpc to pc for distance modulus
\ No newline at end of file
+        # 5 * log10(d_L * 1e6) - 5 with d_L in Mpc
+        if np.isscalar(z):
+            d_L = (1.0 + z) * float(self._interp_comoving(z))
+            if d_L == 0.0:
+                return -math.inf  # z = 0; match np.log10 rather than raising
+            return 5.0 * math.log10(d_L) + 25.0
+        # Arrays are evaluated in place on a single buffer
+        mu = np.array(z, dtype=float)
+        mu += 1.0
+        mu *= self._interp_comoving(z)
+        np.log10(mu, out=mu)
+        mu *= 5.0
+        mu += 25.0
+        return mu
+
+_ACTIVE: Cosmology | None = None
+
+def set_cosmology(params: dict | None = None) -> Cosmology:
+    """
+    Builds a Cosmology from the given parameters and makes it the globally active one.
+
+    :param params: Keyword arguments for Cosmology (h, Omega_m, Omega_lambda); Planck 2018 if None
+    :return: The new active Cosmology
+    """
+    global _ACTIVE
+    _ACTIVE = Cosmology(**(params or {}))
+    return _ACTIVE
+
+def get_cosmology() -> Cosmology:
+    """
+    Returns the globally active Cosmology, creating the Planck 2018 default on first use.
+
+    :return: The active Cosmology
+    """
+    if _ACTIVE is None:
+        return set_cosmology()
+    return _ACTIVE
\ No newline at end of file
@@ -1,31 +1,50 @@
-import tracers
 import numpy as np
 
-def generate_redshifts(n) -> np.ndarray:
+from . import tracers
+
+_RNG = np.random.default_rng()
+
+def _split_counts(n, rng: np.random.Generator) -> np.ndarray:
+    """
+    Splits n at random between the tracers in tracers.TRACER_TYPES, each equally likely per galaxy.
+
+    :param n: Total number of galaxies
+    :param rng: Random number generator
+    :return: Number of galaxies per tracer, summing to n
+    """
+    n_types = len(tracers.TRACER_TYPES)
+    return rng.multinomial(n, np.full(n_types, 1.0 / n_types))
+
+def generate_redshifts(n, rng: np.random.Generator | None = None) -> np.ndarray:
     """
-    Generates an array of sampled redshifts using the ELG tracer.
+    Generates an array of sampled redshifts split at random between the LRG, ELG, QSO and BGS tracers.
 
     :param n: Number of redshift samples to generate
+    :param rng: Random number generator for the tracer split and the redshift draws; a module-level default_rng() if None
     :return: Array of sampled redshifts
     """
-    edge_1 = np.random.randint(0, n + 1)
-    edge_2 = np.random.randint(0, n + 1)
-    edge_3 = np.random.randint(0, n + 1)
-    n_lrg = edge_1
-    n_elg = edge_2 - edge_1
-    n_qso = edge_3 - edge_2
-    n_bgs = n - edge_3
-    lrg_tracer = tracers.LRG()
-    elg_tracer = tracers.ELG()
-    qso_tracer = tracers.QSO()
-    bgs_tracer = tracers.BGS()
-    redshifts = []
-    if n_lrg > 0:
-        redshifts.extend(lrg_tracer.sample_redshifts(n_lrg))
-    if n_elg > 0:
-        redshifts.extend(elg_tracer.sample_redshifts(n_elg))
-    if n_qso > 0:
-        redshifts.extend(qso_tracer.sample_redshifts(n_qso))
-    if n_bgs > 0:
-        redshifts.extend(bgs_tracer.sample_redshifts(n_bgs))
-    return np.array(redshifts)
\ No newline at end of file
+    rng = rng if rng is not None else _RNG
+    counts = _split_counts(n, rng)
+    redshifts = rng.random(n) # One uniform draw for every galaxy, inverted in place per tracer
+    start = 0
+    for name, count in zip(tracers.TRACER_TYPES, counts):
+        tracers.get_tracer(name).redshifts_from_uniforms(redshifts[start:start + count])
+        start += count
+    return redshifts
+
+def generate_catalog(n, rng: np.random.Generator | None = None) -> dict[str, np.ndarray]:
+    """
+    Generates a mixed LRG, ELG, QSO and BGS galaxy catalog, filling one preallocated structure-of-arrays buffer.
+
+    :param n: Number of galaxies to generate
+    :param rng: Random number generator for the tracer split and every catalog column; a module-level default_rng() if None
+    :return: Contiguous per-column arrays keyed by tracers.CATALOG_COLUMNS
+    """
+    rng = rng if rng is not None else _RNG
+    counts = _split_counts(n, rng)
+    catalog = np.empty((len(tracers.CATALOG_COLUMNS), n))
+    start = 0
+    for name, count in zip(tracers.TRACER_TYPES, counts):
+        tracers.get_tracer(name).sample_catalog(count, out=catalog[:, start:start + count], rng=rng)
+        start += count
+    return dict(zip(tracers.CATALOG_COLUMNS, catalog))
\ No newline at end of file
@@ -1,7 +1,83 @@
+from functools import cached_property, lru_cache
+
 import numpy as np
 from scipy.special import erf
 
+try:
+    from ._kernels import cumulative_cdf, inverse_cdf_sample
+except ImportError:  # Compiled extension not built, fall back to NumPy
+    cumulative_cdf = inverse_cdf_sample = None
+
+# ------------------------------------------------------------------------------ n(z) Kernels ------------------------------------------------------------------------------
+
+# Kernels are evaluated in place on two buffers rather than one temporary per operation
+
+def _erf_top_hat(z, z_min, z_max, inv_s) -> np.ndarray:
+    """
+    Top hat between z_min and z_max with Gaussian (error function) tails.
+
+    :param z: Redshift array
+    :param z_min: Lower edge of the top hat
+    :param z_max: Upper edge of the top hat
+    :param inv_s: Precomputed 1 / (sqrt(2) * sigma) for tail width sigma
+    :return: n(z) as a numpy array
+    """
+    z = np.asarray(z, dtype=float)
+    out = np.subtract(z, z_min, out=np.empty_like(z))
+    out *= inv_s
+    erf(out, out=out)
+    upper = np.subtract(z, z_max, out=np.empty_like(z))
+    upper *= inv_s
+    erf(upper, out=upper)
+    out -= upper
+    out *= 0.5
+    return out
+
+def _schechter(z, alpha, beta, z0) -> np.ndarray:
+    """
+    Modified Schechter form z^alpha * exp(-(z / z0)^beta).
+
+    :param z: Redshift array
+    :param alpha: Power law slope
+    :param beta: Exponential cut-off slope
+    :param z0: Cut-off redshift
+    :return: n(z) as a numpy array
+    """
+    z = np.asarray(z, dtype=float)
+    out = np.divide(z, z0, out=np.empty_like(z))
+    np.power(out, beta, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    out *= np.power(z, alpha, out=np.empty_like(z))
+    return out
+
+# Redshift grid shared by every tracer's CDF table; read-only so no caller can corrupt it
+_CDF_Z_GRID = np.linspace(0.0, 5.0, 4096)
+_CDF_Z_GRID.flags.writeable = False
+
+# Column order of the buffer filled by Tracer.sample_catalog
+CATALOG_COLUMNS = ("redshift", "absolute_magnitude", "peculiar_velocity")
+
+def _check_out(out: np.ndarray, shape: tuple[int, ...]) -> None:
+    """
+    Rejects a caller-provided output buffer whose shape does not match the requested sample size.
+
+    :param out: Output buffer
+    :param shape: Expected shape
+    :raises ValueError: If out.shape != shape
+    """
+    if out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+
 class Tracer:
+    def __init__(self, rng: np.random.Generator | None = None):
+        """
+        Initializes the tracer's random number generator.
+        Parameters:
+            rng (np.random.Generator, optional): Generator used for all sampling. A fresh PCG64 default_rng() if None.
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+
     def n_of_z(self, z) -> np.ndarray:
         """
         Returns the normalized redshift distribution n(z) for the tracer.
@@ -12,66 +88,140 @@ class Tracer:
         """
         raise NotImplementedError("This method should be overridden by subclasses.")
     
-    def sample_redshifts(self, n) -> np.ndarray:
+    @cached_property
+    def _cdf_table(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Tabulates the cumulative distribution of n_of_z on [0, 5], built once on first use and reused by every sampling call.
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Shared redshift grid and the normalized CDF on that grid.
         """
-        Generates a sample of redshifts according to the tracer's n_of_z distribution using rejection sampling.
+        z_grid = _CDF_Z_GRID
+        pdf = np.ascontiguousarray(self.n_of_z(z_grid), dtype=float)
+        if cumulative_cdf is not None:
+            cdf = np.empty_like(z_grid)
+            cumulative_cdf(z_grid, pdf, cdf)
+            return z_grid, cdf
+        cdf = np.concatenate(([0.0], np.cumsum(0.5 * (pdf[1:] + pdf[:-1]) * np.diff(z_grid))))
+        cdf /= cdf[-1]
+        return z_grid, cdf
+
+    def redshifts_from_uniforms(self, u) -> np.ndarray:
+        """
+        Maps uniform deviates to redshifts by inverting the tracer's tabulated CDF, overwriting u in place.
+        Parameters:
+            u (np.ndarray): Array of uniform deviates in [0, 1). Must be C-contiguous float64 when the compiled
+                extension is built; the NumPy fallback also accepts strided buffers.
+        Returns:
+            np.ndarray: u, now holding the corresponding redshifts.
+        """
+        z_grid, cdf = self._cdf_table
+        if inverse_cdf_sample is not None:
+            inverse_cdf_sample(cdf, z_grid, u, u)
+        else:
+            u[...] = np.interp(u, cdf, z_grid)
+        return u
+
+    def sample_redshifts(self, n: int, out: np.ndarray | None = None, rng: np.random.Generator | None = None) -> np.ndarray:
+        """
+        Generates a sample of redshifts according to the tracer's n_of_z distribution using inverse transform sampling.
         Parameters:
             n (int): Number of redshift samples to generate.
+            out (np.ndarray, optional): C-contiguous float64 buffer of shape (n,) to fill. Allocated if None.
+            rng (np.random.Generator, optional): Generator to draw from instead of self.rng.
+        Raises:
+            ValueError: If out is given with the wrong shape.
         Returns:
             np.ndarray: Array of sampled redshifts.
         """
-        samples = []
-        z_min, z_max = 0.0, 5.0
-        max_prob_estimate = self.max_prob_estimate
-
-        while len(samples) < n:
-            # Generate a batch of proposed redshifts and probabilities
-            batch_size = (n - len(samples)) * 3 # Oversample to improve acceptance rate. Guess the efficiency is ~1/3
-            z_proposal = np.random.uniform(z_min, z_max, size=batch_size) # Uniform random redshift proposals
-            prob_proposal = np.random.uniform(0, max_prob_estimate, size=batch_size) # Uniform random probabilities
-
-            # Determine which proposals are accepted by evaluating n_of_z at proposed redshifts
-            accepted = prob_proposal < self.n_of_z(z_proposal) # Vectorised acceptance mask
-
-            # Append accepted samples to the list of samples
-            samples.extend(z_proposal[accepted]) # Append accepted samples
-
-        return np.array(samples[:n]) # Return only the requested number of samples
+        rng = rng if rng is not None else self.rng
+        if out is None:
+            out = np.empty(n)
+        else:
+            _check_out(out, (n,))
+        rng.random(out=out)
+        return self.redshifts_from_uniforms(out)
     
-    def sample_absolute_magnitudes(self, n) -> np.ndarray:
+    def sample_absolute_magnitudes(self, n: int, out: np.ndarray | None = None, rng: np.random.Generator | None = None) -> np.ndarray:
         """
         Generates a sample of absolute magnitudes for the tracer.
         Parameters:
             n (int): Number of absolute magnitude samples to generate.
+            out (np.ndarray, optional): C-contiguous float64 buffer of shape (n,) to fill. Allocated if None.
+            rng (np.random.Generator, optional): Generator to draw from instead of self.rng.
+        Raises:
+            ValueError: If out is given with the wrong shape.
         Returns:
             np.ndarray: Array of sampled absolute magnitudes.
         """        # Placeholder implementation: uniform distribution between -22 and -18
-        return np.random.uniform(-22, -18, size=n)
+        rng = rng if rng is not None else self.rng
+        if out is None:
+            out = np.empty(n)
+        else:
+            _check_out(out, (n,))
+        rng.random(out=out)
+        out *= 4.0
+        out -= 22.0
+        return out
     
-    def sample_peculiar_velocity(self, n) -> np.ndarray:
+    def sample_peculiar_velocity(self, n: int, out: np.ndarray | None = None, rng: np.random.Generator | None = None) -> np.ndarray:
         """
         Generates a sample of velocities for the tracer.
         Parameters:
             n (int): Number of velocity samples to generate.
+            out (np.ndarray, optional): C-contiguous float64 buffer of shape (n,) to fill. Allocated if None.
+            rng (np.random.Generator, optional): Generator to draw from instead of self.rng.
+        Raises:
+            ValueError: If out is given with the wrong shape.
         Returns:
             np.ndarray: Array of sampled velocities.
         """        # Placeholder implementation: normal distribution with mean 0 and stddev 300 km/s
-        return np.random.normal(0, 300, size=n)
+        rng = rng if rng is not None else self.rng
+        if out is None:
+            out = np.empty(n)
+        else:
+            _check_out(out, (n,))
+        rng.standard_normal(out=out)
+        out *= 300.0
+        return out
+
+    def sample_catalog(self, n: int, out: np.ndarray | None = None, rng: np.random.Generator | None = None) -> dict[str, np.ndarray]:
+        """
+        Generates a catalog of n galaxies as a structure of arrays backed by a single buffer.
+        Parameters:
+            n (int): Number of galaxies to generate.
+            out (np.ndarray, optional): Float64 buffer of shape (len(CATALOG_COLUMNS), n) with C-contiguous rows to fill. Allocated if None.
+            rng (np.random.Generator, optional): Generator to draw from instead of self.rng.
+        Raises:
+            ValueError: If out is given with the wrong shape.
+        Returns:
+            dict[str, np.ndarray]: Contiguous per-column views into the buffer, keyed by CATALOG_COLUMNS.
+        """
+        if out is None:
+            out = np.empty((len(CATALOG_COLUMNS), n))
+        else:
+            _check_out(out, (len(CATALOG_COLUMNS), n))
+        self.sample_redshifts(n, out=out[0], rng=rng)
+        self.sample_absolute_magnitudes(n, out=out[1], rng=rng)
+        self.sample_peculiar_velocity(n, out=out[2], rng=rng)
+        return dict(zip(CATALOG_COLUMNS, out))
 
 # ------------------------------------------------------------------------------ Tracer Subclasses ------------------------------------------------------------------------------
 
 # ------------------------------------------------------------------------------ LRG Tracer ------------------------------------------------------------------------------
 
 class LRG(Tracer): # Luminous Red Galaxy
-    def __init__(self):
+    def __init__(self, rng: np.random.Generator | None = None):
         """
         Initializes the LRG tracer with specific parameters.
 
         :param self: Instance of LRG class
+        :param rng: Random number generator, a fresh default_rng() if None
         """
+        super().__init__(rng)
         self.z_min = 0.4
         self.z_max = 1.0
         self.sigma = 0.1
+        self._inv_s = 1.0 / (np.sqrt(2.0) * self.sigma) # erf argument scaling
         self.norm = 1.0 / (self.z_max - self.z_min)
 
     def n_of_z(self, z) -> np.ndarray:
@@ -82,80 +232,95 @@ class LRG(Tracer): # Luminous Red Galaxy
         :param z: Redshift array
         :return: Number density n(z) as a numpy array
         """
-        n_of_z = 0.5 * (erf((z - self.z_min) / np.sqrt(2) * self.sigma) - erf((z - self.z_max) / np.sqrt(2) * self.sigma))
-        return n_of_z
-    
-    def sample_absolute_magnitudes(self, n):
-        
+        return _erf_top_hat(z, self.z_min, self.z_max, self._inv_s)
     
-# ------------------------------------------------------------------------------ ELG Tracer ------------------------------------------------------------------------------
+# ------------------------------------------------------------------------------ Schechter Tracers ------------------------------------------------------------------------------
 
-class ELG(Tracer): # Emission Line Galaxy
-    def __init__(self):
+class _SchechterTracer(Tracer): # Shared base for tracers with a modified Schechter n(z)
+    def __init__(self, alpha: float, beta: float, z0: float, rng: np.random.Generator | None = None):
         """
-        Initializes the ELG tracer with specific parameters.
-        
-        :param self: Instance of ELG class
+        Initializes a tracer with n(z) = z^alpha * exp(-(z / z0)^beta).
+
+        :param self: Instance of a Schechter tracer
+        :param alpha: Power law slope
+        :param beta: Exponential cut-off slope
+        :param z0: Cut-off redshift
+        :param rng: Random number generator, a fresh default_rng() if None
         """
-        self.alpha = 2.0
-        self.beta = 1.5
-        self.z0 = 0.8
-        self.max_prob_estimate = 1.0
+        super().__init__(rng)
+        self.alpha = alpha
+        self.beta = beta
+        self.z0 = z0
 
     def n_of_z(self, z) -> np.ndarray:
         """
-        Modified Schechter function model for number density of ELG galaxies.
-        
-        :param self: Instance of ELG class
+        Modified Schechter function model for number density of galaxies.
+
+        :param self: Instance of a Schechter tracer
         :param z: Redshift array
         :return: Number density n(z) as a numpy array
         """
-        n_of_z = z ** self.alpha * np.exp(-(z / self.z0) ** self.beta)
-        return n_of_z
+        return _schechter(z, self.alpha, self.beta, self.z0)
+
+# ------------------------------------------------------------------------------ ELG Tracer ------------------------------------------------------------------------------
+
+class ELG(_SchechterTracer): # Emission Line Galaxy
+    def __init__(self, rng: np.random.Generator | None = None):
+        """
+        Initializes the ELG tracer with a modified Schechter n(z) peaking at intermediate redshift.
+        
+        :param self: Instance of ELG class
+        :param rng: Random number generator, a fresh default_rng() if None
+        """
+        super().__init__(alpha=2.0, beta=1.5, z0=0.8, rng=rng)
     
 # ------------------------------------------------------------------------------ QSO Tracer ------------------------------------------------------------------------------
     
-class QSO(Tracer): # Quasi-Stellar Object (Quasar)
-    def __init__(self):
+class QSO(_SchechterTracer): # Quasi-Stellar Object (Quasar)
+    def __init__(self, rng: np.random.Generator | None = None):
         """
-        Initializes the QSO tracer with specific parameters.
+        Initializes the QSO tracer with a power law and exponential n(z), the beta = 1 Schechter case.
 
         :param self: Instance of QSO class
+        :param rng: Random number generator, a fresh default_rng() if None
         """
-        self.z_star = 2.0
-
-    def n_of_z(self, z) -> np.ndarray:
-        """
-        Power law and exponential model for number density of quasars.
-        
-        :param self: Instance of QSO class
-        :param z: Redshift array
-        :return: Number density n(z) as a numpy array
-        """
-        n_of_z = z ** 2 * np.exp(-z / self.z_star)
-        return n_of_z
+        super().__init__(alpha=2.0, beta=1.0, z0=2.0, rng=rng)
     
 # ------------------------------------------------------------------------------ BGS Tracer ------------------------------------------------------------------------------
 
-class BGS(Tracer): # Bright Galaxy Survey (Main Sequence Galaxy)
-    def __init__(self):
+class BGS(_SchechterTracer): # Bright Galaxy Survey (Main Sequence Galaxy)
+    def __init__(self, rng: np.random.Generator | None = None):
         """
-        Initializes the BGS tracer with specific parameters.
+        Initializes the BGS tracer with a modified Schechter n(z) concentrated at low redshift.
         
         :param self: Instance of BGS class
+        :param rng: Random number generator, a fresh default_rng() if None
         """
-        self.alpha = 2.0
-        self.beta = 1.5
-        self.z0 = 0.2
-        self.max_prob_estimate = 1.0
+        super().__init__(alpha=2.0, beta=1.5, z0=0.2, rng=rng)
 
-    def n_of_z(self, z) -> np.ndarray:
-        """
-        Modified Schechter function model for number density of BGS galaxies.
-        
-        :param self: Instance of BGS class
-        :param z: Redshift array
-        :return: Number density n(z) as a numpy array
-        """
-        n_of_z = z ** self.alpha * np.exp(-(z / self.z0) ** self.beta)
-        return n_of_z
\ No newline at end of file
+# ------------------------------------------------------------------------------ Tracer Registry ------------------------------------------------------------------------------
+
+TRACER_TYPES = {"LRG": LRG, "ELG": ELG, "QSO": QSO, "BGS": BGS}
+
+@lru_cache(maxsize=None)
+def get_tracer(name: str) -> Tracer:
+    """
+    Returns the shared instance of the named tracer, so its CDF table is only built once per process.
+    Its generator is unseeded until seed_tracers is called.
+
+    :param name: Tracer type, one of TRACER_TYPES
+    :return: Tracer instance
+    """
+    if name not in TRACER_TYPES:
+        raise ValueError(f"Unknown tracer type {name!r}, expected one of {list(TRACER_TYPES)}")
+    return TRACER_TYPES[name]()
+
+def seed_tracers(seed: int | None = None) -> None:
+    """
+    Reseeds the shared tracer instances returned by get_tracer, giving each an independent PCG64 stream spawned from seed.
+
+    :param seed: Seed for the shared generators; fresh OS entropy if None
+    """
+    streams = np.random.SeedSequence(seed).spawn(len(TRACER_TYPES))
+    for name, stream in zip(TRACER_TYPES, streams):
+        get_tracer(name).rng = np.random.default_rng(stream)
\ No newline at end of file
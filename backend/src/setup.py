@@ -0,0 +1,11 @@
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+extensions = [
+    Extension("cosmoflow._kernels", ["cosmoflow/_kernels.pyx"], extra_compile_args=["-O3"]),
+]
+
+setup(
+    packages=["cosmoflow"],
+    ext_modules=cythonize(extensions),
+)
@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+from scipy.integrate import quad
+
+from cosmoflow.cosmology import Cosmology, get_cosmology, set_cosmology
+
+
+@pytest.fixture(scope="module")
+def cosmo():
+    return Cosmology()
+
+
+@pytest.mark.parametrize("z", [0.1, 0.5, 1.0, 3.0, 5.0])
+def test_comoving_distance_matches_quad(cosmo, z):
+    expected, _ = quad(lambda zp: cosmo.c / cosmo.H0 / cosmo.E(zp), 0.0, z)
+    assert cosmo.comoving_distance(z) == pytest.approx(expected, rel=1e-6)
+
+
+def test_comoving_distance_accepts_arrays(cosmo):
+    z = np.array([0.0, 0.5, 1.0])
+    np.testing.assert_allclose(cosmo.comoving_distance(z), [cosmo.comoving_distance(float(zi)) for zi in z])
+
+
+@pytest.mark.parametrize("z", [-0.1, 5.5, np.array([0.5, 6.0])])
+@pytest.mark.parametrize("method", ["comoving_distance", "luminosity_distance", "distance_modulus"])
+def test_distances_reject_redshifts_outside_table(cosmo, method, z):
+    with pytest.raises(ValueError):
+        getattr(cosmo, method)(z)
+
+
+def test_distance_modulus_scalar_zero_is_minus_inf(cosmo):
+    assert cosmo.distance_modulus(0.0) == -math.inf
+
+
+def test_distance_modulus_scalar_matches_array(cosmo):
+    z = np.array([0.1, 0.5, 2.0])
+    expected = 5 * np.log10(cosmo.luminosity_distance(z) * 1e6) - 5
+    np.testing.assert_allclose(cosmo.distance_modulus(z), expected, rtol=1e-12)
+    for zi, mu in zip(z, expected):
+        assert cosmo.distance_modulus(float(zi)) == pytest.approx(mu, rel=1e-12)
+
+
+def test_active_cosmology_is_shared():
+    active = set_cosmology({"h": 0.7, "Omega_m": 0.3, "Omega_lambda": 0.7})
+    assert get_cosmology() is active
+    assert active.H0 == pytest.approx(70.0)
+    set_cosmology()
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+_kernels = pytest.importorskip("cosmoflow._kernels")
+
+from cosmoflow import tracers
+
+
+def _numpy_cdf(z_grid, pdf):
+    cdf = np.concatenate(([0.0], np.cumsum(0.5 * (pdf[1:] + pdf[:-1]) * np.diff(z_grid))))
+    cdf /= cdf[-1]
+    return cdf
+
+
+@pytest.mark.parametrize("name", list(tracers.TRACER_TYPES))
+def test_cumulative_cdf_matches_numpy(name):
+    z_grid = tracers._CDF_Z_GRID
+    pdf = np.ascontiguousarray(tracers.TRACER_TYPES[name]().n_of_z(z_grid), dtype=float)
+    cdf = np.empty_like(z_grid)
+    _kernels.cumulative_cdf(z_grid, pdf, cdf)
+    assert cdf[0] == 0.0
+    assert cdf[-1] == 1.0
+    np.testing.assert_allclose(cdf, _numpy_cdf(z_grid, pdf), rtol=1e-12, atol=1e-15)
+
+
+@pytest.mark.parametrize("name", list(tracers.TRACER_TYPES))
+def test_inverse_cdf_sample_matches_numpy(name):
+    z_grid = tracers._CDF_Z_GRID
+    cdf = _numpy_cdf(z_grid, tracers.TRACER_TYPES[name]().n_of_z(z_grid))
+    # Include both ends of [0, 1), where the bisection brackets are tightest
+    u = np.concatenate(([0.0, np.nextafter(1.0, 0.0)], np.random.default_rng(0).random(10000)))
+    out = np.empty_like(u)
+    _kernels.inverse_cdf_sample(cdf, z_grid, u, out)
+    assert np.all(np.isfinite(out))
+    np.testing.assert_allclose(out, np.interp(u, cdf, z_grid), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (np.linspace(0.0, 1.0, 10), np.linspace(0.0, 1.0, 10), np.ones(10), np.empty(3)),
+        (np.linspace(0.0, 1.0, 10), np.linspace(0.0, 1.0, 9), np.ones(3), np.empty(3)),
+    ],
+)
+def test_inverse_cdf_sample_rejects_mismatched_lengths(args):
+    with pytest.raises(ValueError):
+        _kernels.inverse_cdf_sample(*args)
+
+
+@pytest.mark.parametrize(
+    "z, pdf, out",
+    [
+        (np.empty(0), np.empty(0), np.empty(0)),
+        (np.linspace(0.0, 1.0, 10), np.ones(5), np.empty(10)),
+        (np.linspace(0.0, 1.0, 10), np.ones(10), np.empty(5)),
+    ],
+)
+def test_cumulative_cdf_rejects_bad_lengths(z, pdf, out):
+    with pytest.raises(ValueError):
+        _kernels.cumulative_cdf(z, pdf, out)
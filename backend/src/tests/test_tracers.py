@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from cosmoflow import survey, tracers
+
+
+def test_lrg_n_of_z_is_a_top_hat():
+    lrg = tracers.LRG()
+    assert lrg.n_of_z(np.array([0.7]))[0] == pytest.approx(1.0, abs=1e-2)
+    np.testing.assert_allclose(lrg.n_of_z(np.array([0.0, 1.5])), 0.0, atol=1e-3)
+
+
+@pytest.mark.parametrize("name", list(tracers.TRACER_TYPES))
+def test_sample_redshifts_within_grid(name):
+    z = tracers.TRACER_TYPES[name](rng=np.random.default_rng(0)).sample_redshifts(1000)
+    assert z.shape == (1000,)
+    assert np.all((z >= 0.0) & (z <= 5.0))
+
+
+def test_lrg_redshifts_follow_top_hat():
+    z = tracers.LRG(rng=np.random.default_rng(0)).sample_redshifts(10000)
+    assert np.mean(z) == pytest.approx(0.7, abs=0.02)
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 1000])
+def test_split_counts_sum_to_n(n):
+    counts = survey._split_counts(n, np.random.default_rng(n))
+    assert counts.sum() == n
+    assert np.all(counts >= 0)
+
+
+@pytest.mark.parametrize("n", [0, 1, 1000])
+def test_generate_redshifts_shape(n):
+    assert survey.generate_redshifts(n).shape == (n,)
+
+
+def test_generate_redshifts_reproducible_with_rng():
+    a = survey.generate_redshifts(100, rng=np.random.default_rng(1))
+    b = survey.generate_redshifts(100, rng=np.random.default_rng(1))
+    np.testing.assert_array_equal(a, b)
+
+
+def test_generate_catalog_reproducible_with_rng():
+    a = survey.generate_catalog(100, rng=np.random.default_rng(1))
+    b = survey.generate_catalog(100, rng=np.random.default_rng(1))
+    assert list(a) == list(tracers.CATALOG_COLUMNS)
+    for column in tracers.CATALOG_COLUMNS:
+        assert a[column].shape == (100,)
+        np.testing.assert_array_equal(a[column], b[column])
+
+
+def test_seed_tracers_makes_shared_tracers_reproducible():
+    tracers.seed_tracers(3)
+    a = tracers.get_tracer("ELG").sample_catalog(50)
+    tracers.seed_tracers(3)
+    b = tracers.get_tracer("ELG").sample_catalog(50)
+    for column in tracers.CATALOG_COLUMNS:
+        np.testing.assert_array_equal(a[column], b[column])
+
+
+def test_sample_redshifts_rejects_wrong_out_shape():
+    with pytest.raises(ValueError):
+        tracers.ELG().sample_redshifts(3, out=np.zeros(10))
+
+
+def test_sample_catalog_rejects_wrong_out_shape():
+    with pytest.raises(ValueError):
+        tracers.ELG().sample_catalog(3, out=np.zeros((len(tracers.CATALOG_COLUMNS), 10)))
+
+
+def test_get_tracer_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        tracers.get_tracer("XYZ")